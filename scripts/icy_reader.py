@@ -0,0 +1,246 @@
+import asyncio
+import io
+import re
+import socket
+
+from typing import Optional
+from urllib.parse import urljoin, urlsplit
+
+# Közös ICY (Shoutcast/Icecast) metadata olvasó a state machine-nek
+# és a teszt scripteknek: streamenként egy tartós kapcsolat.
+
+# Bájtokon illesztünk; dekódolni csak a megtalált címet kell
+_TITLE_RE = re.compile(rb"StreamTitle='([^';]+)")
+_METAINT_RE = re.compile(rb"^icy-metaint:\s*(\d+)", re.IGNORECASE | re.MULTILINE)
+_LOCATION_RE = re.compile(rb"^location:\s*(\S+)", re.IGNORECASE | re.MULTILINE)
+
+# A rádió URL-ek gyakran load balancerre / CDN-re irányítanak át
+_REDIRECTS = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5
+
+USER_AGENT = "RadioMetadataExtractor/1.0"
+META_ENCODING = "iso-8859-2"
+
+
+def extract_title(metadata: bytes) -> Optional[str]:
+    m = _TITLE_RE.search(metadata)
+    return m.group(1).decode(META_ENCODING, "ignore").strip() if m else None
+
+
+def _parse_url(url: str) -> tuple[str, int, str]:
+    parts = urlsplit(url)
+    # Nincs TLS: https-t nem csendben HTTP-re rontunk, hanem elutasítjuk
+    if parts.scheme.lower() != "http":
+        raise ValueError(f"unsupported stream URL scheme (plain http only): {url}")
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    return parts.hostname or "localhost", parts.port or 80, path
+
+
+def _build_request(host: str, path: str, user_agent: str) -> bytes:
+    return (
+        f"GET {path} HTTP/1.0\r\n"
+        f"Host: {host}\r\n"
+        "Icy-MetaData: 1\r\n"
+        f"User-Agent: {user_agent}\r\n"
+        "\r\n"
+    ).encode("latin-1")
+
+
+def _status_code(status: bytes) -> int:
+    # "ICY 200 OK" vagy "HTTP/1.0 200 OK"
+    fields = status.split()
+    if len(fields) < 2 or not fields[1].isdigit():
+        raise ConnectionError(f"unexpected ICY status: {status!r}")
+    return int(fields[1])
+
+
+def _redirect_target(url: str, status: bytes, headers: bytes) -> Optional[str]:
+    """Absolute URL to follow for a 3xx reply, None for 200; raises on anything else."""
+    code = _status_code(status)
+    if code == 200:
+        return None
+    if code in _REDIRECTS:
+        m = _LOCATION_RE.search(headers)
+        if not m:
+            raise ConnectionError(f"ICY redirect without Location: {status!r}")
+        return urljoin(url, m.group(1).decode("latin-1"))
+    raise ConnectionError(f"unexpected ICY status: {status!r}")
+
+
+def _parse_metaint(headers: bytes) -> int:
+    m = _METAINT_RE.search(headers)
+    return int(m.group(1)) if m else 0
+
+
+class ICYReader:
+    """
+    Blocking ICY client: one hand-written GET on a plain socket,
+    then fixed-size readinto calls into preallocated buffers.
+    """
+
+    def __init__(self, url: str, timeout: float = 2.0, user_agent: str = USER_AGENT):
+        self.url = url
+        self.host, self.port, self.path = _parse_url(url)
+        self.timeout = timeout
+        self.user_agent = user_agent
+
+        self._sock: socket.socket | None = None
+        self._raw: io.BufferedReader | None = None
+        self.metaint = 0
+        self._skip_view: Optional[memoryview] = None
+        self._meta_view = memoryview(bytearray(4096))  # max. 255 * 16 bájt
+
+    @property
+    def is_open(self) -> bool:
+        return self._raw is not None
+
+    def open(self) -> bool:
+        """Connect and parse the response headers; False if the stream has no ICY metadata."""
+        url = self.url
+        for _ in range(MAX_REDIRECTS + 1):
+            self.close()
+            self.host, self.port, self.path = _parse_url(url)
+
+            self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            self._sock.sendall(_build_request(self.host, self.path, self.user_agent))
+
+            # A BufferedReader megtartja a fejléc után már beolvasott audio bájtokat is
+            self._raw = self._sock.makefile("rb", buffering=32 * 1024)
+
+            try:
+                status = self._raw.readline()
+                headers = bytearray()
+                while True:
+                    line = self._raw.readline()
+                    if not line:
+                        raise ConnectionError("ICY stream closed in headers")
+                    if line in (b"\r\n", b"\n"):
+                        break
+                    headers += line
+                url = _redirect_target(url, status, headers)
+            except Exception:
+                self.close()
+                raise
+
+            if url is None:
+                break
+        else:
+            self.close()
+            raise ConnectionError(f"too many ICY redirects: {self.url}")
+
+        self.metaint = _parse_metaint(headers)
+        if not self.metaint:
+            self.close()
+            return False
+
+        self._skip_view = memoryview(bytearray(self.metaint))
+        return True
+
+    def close(self):
+        if self._raw is not None:
+            try:
+                self._raw.close()
+            except OSError:
+                pass
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._raw = None
+
+    def _read_into(self, view: memoryview):
+        """Fill the whole view from the stream without allocating new bytes."""
+        n = 0
+        while n < len(view):
+            got = self._raw.readinto(view[n:])
+            if not got:
+                raise ConnectionError("ICY stream closed")
+            n += got
+
+    def read_next_meta(self) -> bytes | memoryview:
+        """Raw metadata block; a view into an internal buffer, valid until the next call."""
+        self._read_into(self._skip_view)  # Skip to metadata
+        lb = self._raw.read(1)
+        if not lb:
+            raise ConnectionError("ICY stream closed")
+
+        meta_len = lb[0] * 16
+        if meta_len:
+            meta = self._meta_view[:meta_len]
+            self._read_into(meta)
+            return meta
+        return b""
+
+
+class AsyncICYReader:
+    """
+    ICY client on asyncio streams: same protocol as ICYReader,
+    but every read runs on the event loop without a worker thread.
+    """
+
+    def __init__(self, url: str, user_agent: str = USER_AGENT):
+        self.url = url
+        self.host, self.port, self.path = _parse_url(url)
+        self.user_agent = user_agent
+
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self.metaint = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._reader is not None
+
+    async def open(self) -> bool:
+        """Connect and parse the response headers; False if the stream has no ICY metadata."""
+        url = self.url
+        for _ in range(MAX_REDIRECTS + 1):
+            self.close()
+            self.host, self.port, self.path = _parse_url(url)
+
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            try:
+                self._writer.write(_build_request(self.host, self.path, self.user_agent))
+                await self._writer.drain()
+
+                head = await self._reader.readuntil(b"\r\n\r\n")
+                status, _, headers = head.partition(b"\r\n")
+                url = _redirect_target(url, status, headers)
+            except Exception:
+                self.close()
+                raise
+
+            if url is None:
+                break
+        else:
+            self.close()
+            raise ConnectionError(f"too many ICY redirects: {self.url}")
+
+        self.metaint = _parse_metaint(head)
+        if not self.metaint:
+            self.close()
+            return False
+        return True
+
+    def close(self):
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
+        self._reader = None
+        self._writer = None
+
+    async def read_next_meta(self) -> bytes:
+        """Raw metadata block, undecoded."""
+        await self._reader.readexactly(self.metaint)  # Skip to metadata
+        lb = await self._reader.readexactly(1)
+
+        meta_len = lb[0] * 16
+        if meta_len:
+            return await self._reader.readexactly(meta_len)
+        return b""
@@ -1,21 +1,21 @@
 #!/usr/bin/env python3
 import time
-import re
-import requests
+import socket
 import asyncio
-import subprocess
 import threading
+from datetime import timedelta
 from pathlib import Path
 
 from typing import Optional, Callable
 
-from PIL import ImageFont
+from PIL import Image, ImageDraw, ImageFont
 from luma.core.interface.serial import i2c
 from luma.oled.device import sh1106
-from luma.core.render import canvas
 
 import gpiod
-from gpiod.line import Direction, Bias, Value
+from gpiod.line import Direction, Bias, Edge, Value
+
+from icy_reader import AsyncICYReader, extract_title
 
 # ================= CONFIG =================
 
@@ -27,7 +27,10 @@ FONT_SMALL = str(BASE_DIR / "fonts" / "NotoSans-Medium.ttf")
 
 STREAM_URL = "http://stream.radiomost.hu:8200/live.mp3"
 
-MOODE_VOL_URL = "http://localhost/command/?cmd=get_volume"
+MPD_HOST = "localhost"
+MPD_PORT = 6600
+# moOde alatt az MPD unix socketen is figyel; ha létezik, ezt használjuk
+MPD_SOCKET = "/run/mpd/socket"
 
 STATE_IDLE = 0
 STATE_PLAYING = 1
@@ -35,76 +38,304 @@ STATE_PLAYING = 1
 BUTTON_PIN = 22
 GPIO_CHIP = "/dev/gpiochip0"
 
-POLL_INTERVAL = 0.2
+# Fail-safe státusz lekérdezés az idle események mellé: váltás után
+# 5 mp-ig sűrűn, utána fokozatosan ritkítva 30 mp-ig
+FAILSAFE_FAST = 0.25
+FAILSAFE_FAST_WINDOW = 5.0
+FAILSAFE_MAX = 30.0
+
+# Kis ráhagyás, hogy az ébredés biztosan a határ után essen
+IDLE_WAKE_SLACK = 0.005
+
+# Idle óra ütemezés egész nanoszekundumban, monotonic órán
+BLINK_NS = 1_000_000_000
+SHIFT_NS = 60_000_000_000
+
+# Az I2C buszt egyszerre csak egy szál hajthatja meg
+_display_lock = threading.Lock()
+
+
+# ================= DISPLAY =================
+
+class PagedSH1106(sh1106):
+    """
+    sh1106 that packs frames into page bytes with PIL and only sends
+    the changed column span of the 8-pixel-high pages that differ
+    from the previous frame.
+    """
+
+    def __init__(self, serial_interface=None, **kwargs):
+        # Az sh1106.__init__ már clear()-t hív, ezért előbb kell
+        self._sent_pages: list[Optional[bytes]] = []
+        super().__init__(serial_interface, **kwargs)
+
+    def _to_pages(self, image) -> list[bytes]:
+        # Elforgatás után minden sor egy oszlop; a sor bájtjai alulról felfelé a lapok
+        raw = image.transpose(Image.Transpose.ROTATE_270).tobytes()
+        n = self._pages
+        return [raw[n - 1 - page::n] for page in range(n)]
+
+    def display(self, image):
+        assert image.mode == self.mode
+        assert image.size == self.size
+
+        pages = self._to_pages(self.preprocess(image))
+        if len(self._sent_pages) != len(pages):
+            self._sent_pages = [None] * len(pages)
+
+        for page, data in enumerate(pages):
+            prev = self._sent_pages[page]
+            if data == prev:
+                continue
+
+            lo, hi = 0, len(data)
+            if prev is not None:
+                # Csak az első és utolsó eltérő oszlop közti szakasz (pl. villogó kettőspont)
+                while data[lo] == prev[lo]:
+                    lo += 1
+                while data[hi - 1] == prev[hi - 1]:
+                    hi -= 1
+
+            col = self._page_address_offset + lo
+            self.command(0xB0 + page, col & 0x0F, 0x10 | (col >> 4))
+            self.data(list(data[lo:hi]))
+            self._sent_pages[page] = data
+
+
+# ================= MPD CLIENT =================
+
+class MPDClient:
+    """
+    Minimal MPD text-protocol client over one persistent socket.
+    Replaces forking `mpc` on every poll.
+    """
+
+    def __init__(self, host: str = MPD_HOST, port: int = MPD_PORT, timeout: float = 0.5,
+                 socket_path: str | None = MPD_SOCKET):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.socket_path = socket_path
+
+        self._sock: socket.socket | None = None
+        self._rfile = None
+        self._lock = threading.Lock()
+
+        # Ha az MPD nem elérhető, ennyi ideig meg sem próbálunk csatlakozni
+        self.retry_delay = 1.0
+        self._down_until = 0.0
+
+    def _connect(self):
+        self.close()
+        if self.socket_path and Path(self.socket_path).exists():
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(self.timeout)
+            try:
+                self._sock.connect(self.socket_path)
+            except OSError:
+                # Elavult socket fájl / más MPD bind: TCP-re esünk vissza
+                self._sock.close()
+                self._sock = None
+        if self._sock is None:
+            self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._rfile = self._sock.makefile("rb")
+
+        banner = self._rfile.readline()  # "OK MPD <version>"
+        if not banner.startswith(b"OK MPD"):
+            raise ConnectionError(f"unexpected MPD banner: {banner!r}")
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._rfile.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._rfile = None
+
+    def _exchange(self, cmd: str) -> dict[str, str]:
+        self._sock.sendall(cmd.encode("utf-8") + b"\n")
+
+        result = {}
+        while True:
+            line = self._rfile.readline()
+            if not line:
+                raise ConnectionError("MPD closed the connection")
+            if line == b"OK\n":
+                return result
+            if line.startswith(b"ACK"):
+                raise RuntimeError(line.decode("utf-8", "replace").strip())
+
+            key, _, value = line.decode("utf-8", "replace").partition(": ")
+            result[key] = value.rstrip("\n")
+
+    def command(self, cmd: str) -> dict[str, str]:
+        with self._lock:
+            if self._sock is None and time.monotonic() < self._down_until:
+                raise ConnectionError("MPD unavailable")
+
+            # Egyszer újracsatlakozunk, ha az MPD közben bontotta a kapcsolatot
+            for attempt in range(2):
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._exchange(cmd)
+                except OSError:
+                    self.close()
+                    if attempt:
+                        self._down_until = time.monotonic() + self.retry_delay
+                        raise
+        return {}
+
+    def status(self) -> dict[str, str]:
+        return self.command("status")
+
+    def toggle(self):
+        # Ugyanaz, mint az `mpc toggle`
+        if self.status().get("state") == "play":
+            self.command("pause 1")
+        else:
+            self.command("play")
+
+
+_mpd = MPDClient()
+
+# Egy tick-en belül a get_state és a get_volume_percent ugyanazt a választ használja
+STATUS_TTL = 0.1
+_status_cache: tuple[float, dict[str, str] | None] = (0.0, None)
+
+
+def _mpd_status() -> dict[str, str]:
+    global _status_cache
+    now = time.monotonic()
+    ts, status = _status_cache
+    if status and now - ts < STATUS_TTL:
+        return status
+    status = _mpd.status()
+    _status_cache = (now, status)
+    return status
+
+
+async def _mpd_open_async() -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """asyncio MPD connection (unix socket if present, else TCP), banner already checked."""
+    reader = writer = None
+    if MPD_SOCKET and Path(MPD_SOCKET).exists():
+        try:
+            reader, writer = await asyncio.open_unix_connection(MPD_SOCKET)
+        except OSError:
+            # Elavult socket fájl / más MPD bind: TCP-re esünk vissza
+            pass
+    if writer is None:
+        reader, writer = await asyncio.open_connection(MPD_HOST, MPD_PORT)
+
+    banner = await reader.readline()  # "OK MPD <version>"
+    if not banner.startswith(b"OK MPD"):
+        writer.close()
+        raise ConnectionError(f"unexpected MPD banner: {banner!r}")
+    return reader, writer
+
+
+async def _mpd_async_command(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                             cmd: str) -> dict[str, str]:
+    """One MPD command on an asyncio connection; `idle` blocks here until an event."""
+    writer.write(cmd.encode("utf-8") + b"\n")
+    await writer.drain()
+
+    result = {}
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("MPD closed the connection")
+        if line == b"OK\n":
+            return result
+        if line.startswith(b"ACK"):
+            raise RuntimeError(line.decode("utf-8", "replace").strip())
+
+        key, _, value = line.decode("utf-8", "replace").partition(": ")
+        result[key] = value.rstrip("\n")
 
 
 # ================= HELPERS =================
 
-def extract_title(metadata: str) -> Optional[str]:
-    m = re.search(r"StreamTitle='([^';]+)", metadata)
-    if not m:
+_last_minute = -1
+_last_time_str = ""
+
+
+def _now_hhmm() -> str:
+    """Date + time string, formatted only once per minute."""
+    global _last_minute, _last_time_str
+    minute = int(time.time()) // 60
+    if minute != _last_minute:
+        _last_minute = minute
+        _last_time_str = time.strftime("%Y-%m-%d %H:%M")
+    return _last_time_str
+
+
+def _prerender_glyphs(font, chars: str) -> dict[str, tuple[Image.Image, int]]:
+    """1-bit bitmap + advance width per character, rasterized once with the TTF font."""
+    ascent, descent = font.getmetrics()
+    glyphs = {}
+    for ch in chars:
+        # "1" módú képen a draw.text monokróm hintinggel mér (fontmode="1")
+        adv = int(font.getlength(ch, mode="1"))
+        w = max(adv, font.getbbox(ch)[2], 1)
+        img = Image.new("1", (w, ascent + descent), 0)
+        ImageDraw.Draw(img).text((0, 0), ch, fill=1, font=font)
+        glyphs[ch] = (img, adv)
+    return glyphs
+
+
+_mpd_reachable = True
+
+
+def _mpd_error(e: Exception):
+    # Csak az elérhető -> elérhetetlen váltást logoljuk, nem minden tick-et
+    global _mpd_reachable
+    if _mpd_reachable:
+        print(f"[MPD ERROR] {e}")
+    _mpd_reachable = False
+
+
+def _safe_status() -> Optional[dict[str, str]]:
+    global _mpd_reachable
+    try:
+        status = _mpd_status()
+    except (OSError, RuntimeError) as e:
+        _mpd_error(e)
         return None
-    return m.group(1).strip()
+    _mpd_reachable = True
+    return status
 
 
 def get_volume_percent() -> int:
-    try:
-        out = subprocess.check_output(["mpc"], text=True, timeout=1)
-        vol_match = re.search(r"volume: (\d+)%", out)
-        if vol_match:
-            return max(0, min(100, int(vol_match.group(1))))
-    except Exception:
-        pass
-    
-    # Fallback Moode API-ra
-    try:
-        r = requests.get(MOODE_VOL_URL, timeout=0.5)
-        if r.ok:
-            return max(0, min(100, int(r.json().get("volume", 50))))
-    except Exception:
-        pass
+    status = _safe_status()
+    # MPD -1-et ad, ha nincs mixer
+    vol = status.get("volume", "-1") if status else "-1"
+    if vol.lstrip("-").isdigit() and int(vol) >= 0:
+        return min(100, int(vol))
     return 50
 
 
 def toggle_play_pause():
-    # print("[DEBUG] MPC TOGGLE CALLED!")
     try:
-
-        result = subprocess.run(
-            ["mpc", "toggle"], 
-            capture_output=True, 
-            text=True, 
-            timeout=2
-        )
-        # print(f"MPC STDOUT: {result.stdout.strip()}")
-        # print(f"MPC STDERR: {result.stderr.strip()}")
-        # print(f"MPC RETURN CODE: {result.returncode}")
-        
-        if result.returncode != 0:
-            print("[ERROR] MPC toggle failed!")
-            
-    except subprocess.TimeoutExpired:
-        print("[ERROR] MPC timeout!")
-    except FileNotFoundError:
-        print("[ERROR] mpc command not found!")
+        _mpd.toggle()
     except Exception as e:
-        print(f"[ERROR] MPC exception: {e}")
+        print(f"[ERROR] MPD toggle failed: {e}")
 
 
 def get_state():
-    try:
-        out = subprocess.check_output(["mpc", "status"], text=True, timeout=0.5)
-        if "[playing]" in out:
-            return STATE_PLAYING
-    except Exception:
-        pass
+    status = _safe_status()
+    if status and status.get("state") == "play":
+        return STATE_PLAYING
     return STATE_IDLE
 
 # ================= METADATA HANDLER =================
 
 class NowPlayingExtractHandler:
     """
-    Periodically reads ICY metadata and calls callbacks.
+    Reads ICY metadata in one task and calls `coro` on title changes;
+    a second task calls `update_coro` every `interval` seconds.
     """
 
     def __init__(
@@ -119,75 +350,60 @@ class NowPlayingExtractHandler:
         self.coro = coro
         self.update_coro = update_coro
 
-        self._last_metadata = ""
+        self._last_metadata = b""
         self.last_title = ""
 
         self._stop_event = asyncio.Event()
-        self._session = None
+
+        self._reader = AsyncICYReader(source_url)
 
         self._task: asyncio.Task | None = None
 
-    def _read_metadata(self) -> str: 
-        try:
-            if not self._session:
-                self._session = requests.Session()
-                self._session.headers.update({
-                    "Icy-MetaData": "1",
-                    "User-Agent": "RadioMetadataExtractor/1.0",
-                })
-            
-            r = self._session.get(self.source_url, stream=True, timeout=2)
-            r.raise_for_status()
-
-            metaint = int(r.headers.get("icy-metaint", "0"))
-            if not metaint:
-                return ""
-
-            _ = r.raw.read(metaint)  # Skip to metadata
-            lb = r.raw.read(1)
-            if not lb:
-                return ""
-
-            meta_len = ord(lb) * 16
-            if meta_len:
-                meta = r.raw.read(meta_len)
-                return meta.decode("iso-8859-2", "ignore")
-        except Exception as e:
-            print(f"[META ERROR] {e}")
-        return ""
+    async def _read_next(self) -> bytes:
+        if not self._reader.is_open and not await self._reader.open():
+            return b""
+        return await self._reader.read_next_meta()
 
-    async def _read_metadata_async(self) -> str:
-        """Async wrapper that runs blocking I/O in a thread."""
-        loop = asyncio.get_event_loop()
+    async def _read_metadata(self) -> bytes:
         try:
-            # Az asyncio.to_thread (Python 3.9+) futtatja a szinkron függvényt egy szálban
-            return await asyncio.wait_for(
-                loop.run_in_executor(None, self._read_metadata),
-                timeout=3.0
-            )
+            return await asyncio.wait_for(self._read_next(), timeout=3.0)
         except asyncio.TimeoutError:
             print("[META TIMEOUT] Metadata read took too long")
-            return ""
         except Exception as e:
             print(f"[META ERROR] {e}")
-            return ""
+        # A következő hívás újracsatlakozik
+        self._reader.close()
+        return b""
 
-    async def _loop(self):
+    async def _meta_loop(self):
+        # Csak a címváltozást továbbítja; a blokkoló stream olvasás
+        # (audio bitráta ütemében) nem lassítja a képernyő tick-et
+        try:
+            while not self._stop_event.is_set():
+                meta = await self._read_metadata()
+                if not meta:
+                    # Hiba / nincs metadata (a reader lezárva): ne pörögjön az újracsatlakozás.
+                    # Üres metadata blokk (változatlan cím) esetén azonnal olvasunk tovább.
+                    if not self._reader.is_open:
+                        await asyncio.sleep(self.interval)
+                    continue
+
+                # Csak változáskor dekódolunk
+                if meta != self._last_metadata:
+                    self._last_metadata = meta
+                    self.last_title = extract_title(meta) or ""
+                    if self.coro:
+                        await self.coro(self.last_title)
+
+        except asyncio.CancelledError:
+            pass
+
+    async def _tick_loop(self):
+        # Görgetés / hangerő / óra: fix `interval` ütemben
         try:
             next_t = time.monotonic() + self.interval
 
             while not self._stop_event.is_set():
-                meta = await self._read_metadata_async()  # <-- ASYNC HÍVÁS!
-                if meta:
-                    if meta != self._last_metadata:
-                        self._last_metadata = meta
-                        self.last_title = extract_title(meta) or ""
-                        if self.coro:
-                            await self.coro(self.last_title)
-                    else:
-                        if self.coro:
-                            await self.coro(None)
-
                 if self.update_coro:
                     await self.update_coro()
 
@@ -199,18 +415,23 @@ class NowPlayingExtractHandler:
         except asyncio.CancelledError:
             pass
 
-    async def _main(self):
-        self._session = requests.Session()
-        self._session.headers.update({
-            "Icy-MetaData": "1",
-            "User-Agent": "RadioMetadataExtractor/1.0",
-        })
+    async def _loop(self):
+        meta_task = asyncio.create_task(self._meta_loop())
+        try:
+            await self._tick_loop()
+        finally:
+            meta_task.cancel()
+            try:
+                await meta_task
+            except asyncio.CancelledError:
+                pass
 
+    async def _main(self):
         try:
             self._task = asyncio.create_task(self._loop())
             await self._task
         finally:
-            self._session.close()
+            self._reader.close()
 
     async def stop(self):
         self._stop_event.set()
@@ -220,24 +441,24 @@ class NowPlayingExtractHandler:
                 await asyncio.wait_for(self._task, timeout=1.0)
             except asyncio.TimeoutError:
                 pass
-        if self._session:
-            self._session.close()
+        self._reader.close()
 
 # ================= GPIO BUTTON (libgpiod 2.x) =================
 
 class GPIOButton:
     """
-    Simple polling-based GPIO button using libgpiod 2.x
+    Edge-triggered GPIO button using libgpiod 2.x
+    The request's event fd is watched by the asyncio loop, no thread needed.
     Works without root if permissions allow.
     """
 
-    def __init__(self, line: int, on_press, debounce: float = 0.1):
+    def __init__(self, line: int, on_press, debounce: float = 0.05):
         self.line = line
         self.on_press = on_press
         self.debounce = debounce
 
-        self._last_press = 0.0
-        self._stop = threading.Event()
+        self._last_press_ns = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
 
         self.request = gpiod.request_lines(
             GPIO_CHIP,
@@ -246,39 +467,38 @@ class GPIOButton:
                 line: gpiod.LineSettings(
                     direction=Direction.INPUT,
                     bias=Bias.PULL_UP,
+                    edge_detection=Edge.FALLING,
+                    debounce_period=timedelta(seconds=debounce),
                 )
             },
         )
 
-        self._last_state = self.request.get_value(self.line)
-        # print(f"[GPIO] initial state = {self._last_state}")
+    def start(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        loop.add_reader(self.request.fd, self._drain_events)
 
-        self.thread = threading.Thread(target=self._loop, daemon=True)
-        self.thread.start()
+    def _drain_events(self):
+        try:
+            events = self.request.read_edge_events()
+        except Exception as e:
+            print(f"[GPIO ERROR] {e}")
+            return
+
+        debounce_ns = int(self.debounce * 1e9)
+        for event in events:
+            if event.timestamp_ns - self._last_press_ns < debounce_ns:
+                continue
+            self._last_press_ns = event.timestamp_ns
+            if self.on_press:
+                self.on_press()
 
-    def _loop(self):
-        while not self._stop.is_set():
+    def stop(self):
+        if self._loop is not None:
             try:
-                value = self.request.get_value(self.line)
-                state = value.value if hasattr(value, 'value') else value
-                
-                if state != self._last_state:
-                    if state == 0 and self._last_state == 1:
-                        now = time.monotonic()
-                        if now - self._last_press >= 0.05:
-                            self._last_press = now
-                            if self.on_press:
-                                self.on_press()
-                
-                self._last_state = state
-                
+                self._loop.remove_reader(self.request.fd)
             except Exception:
                 pass
-            
-            time.sleep(0.01)
-
-    def stop(self):
-        self._stop.set()
+            self._loop = None
         try:
             self.request.release()
         except Exception:
@@ -288,19 +508,49 @@ class GPIOButton:
 # ================= IDLE SCREEN =================
 
 class IdleScreen:
-    def __init__(self, display, contrast = 50):
+    def __init__(self, display, contrast = 50, framebuffer: Optional[Image.Image] = None):
         self.display = display
         self.contrast = contrast
 
-        self.font_big = ImageFont.truetype(FONT_BIG, 32)
-        self.font_small = ImageFont.truetype(FONT_SMALL, 12)
+        # A framebuffer-t a PlayingScreen-nel közösen használjuk
+        if framebuffer is None:
+            framebuffer = Image.new("1", (128, 64), 0)
+        self._img = framebuffer
+        self._img_draw = ImageDraw.Draw(self._img)
+
+        self.font_big = ImageFont.truetype(FONT_BIG, 32, layout_engine=ImageFont.Layout.BASIC)
+        self.font_small = ImageFont.truetype(FONT_SMALL, 12, layout_engine=ImageFont.Layout.BASIC)
+
+        # Az óra/dátum karakterkészlete fix: egyszer raszterizáljuk, utána csak paste
+        self._glyphs_big = _prerender_glyphs(self.font_big, "0123456789: ")
+        self._glyphs_small = _prerender_glyphs(self.font_small, "0123456789-")
+
+        # A szóköz a kettőspont helyén: ugyanakkora üres cella, így villogáskor
+        # nem mozdulnak a számjegyek, és elég csak ezt a cellát újrarajzolni
+        colon_img, colon_adv = self._glyphs_big[":"]
+        self._glyphs_big[" "] = (Image.new("1", colon_img.size, 0), colon_adv)
+        self._colon_xy = (0, 0)
+        # A teljes cella (ascent + descent) belelógna a dátum sorba: villogáskor
+        # csak a kettőspont tényleges tinta-téglalapját töröljük
+        self._colon_ink = colon_img.getbbox()
+
+        # Ha a számjegyek egyforma szélesek (NotoSans: igen), a "HH:MM" és a
+        # "YYYY-MM-DD" karakterpozíciói és szélessége konstans: egyszer mérjük
+        self._time_layout = self._fixed_layout(self.font_big, self._glyphs_big, "00:00")
+        self._date_layout = self._fixed_layout(self.font_small, self._glyphs_small, "0000-00-00")
 
         self.blink = True
-        self.last_blink = 0
+        self.last_blink_ns = 0
 
         self.shift_x = 0
         self.shift_y = 0
-        self.last_shift = 0
+        self.last_shift_ns = 0
+
+        # localtime/strftime csak percváltáskor
+        self._minute = -1
+        self._timestr = ""
+        self._datestr = ""
+        self._last_rendered = None
 
         self._draw()
 
@@ -310,50 +560,112 @@ class IdleScreen:
         except Exception:
             pass
 
-    def _draw(self):
-        now = time.time()
-        self._set_contrast(self.contrast)
-
-        if now - self.last_blink >= 1:
+    def next_wakeup(self, now_ns: int) -> float:
+        """Seconds until the next blink, shift or minute change."""
+        tick_ns = min(self.last_blink_ns + BLINK_NS, self.last_shift_ns + SHIFT_NS) - now_ns
+        to_minute = 60 - time.time() % 60
+        return max(0.0, min(tick_ns / 1e9, to_minute)) + IDLE_WAKE_SLACK
+
+    def _text_layout(self, font, text: str) -> tuple[list[int], int]:
+        """Per-character x offsets and total width, measured like draw.text on a 1-bit image."""
+        offsets = [int(font.getlength(text[:i], mode="1")) for i in range(len(text))]
+        return offsets, int(font.getlength(text, mode="1"))
+
+    def _fixed_layout(self, font, glyphs, template: str) -> Optional[tuple[list[int], int]]:
+        if len({glyphs[d][1] for d in "0123456789"}) != 1:
+            return None
+        return self._text_layout(font, template)
+
+    def _paste_text(self, glyphs, xy, text: str, offsets: list[int]):
+        x, y = xy
+        for ch, dx in zip(text, offsets):
+            self._img.paste(255, (x + dx, y), glyphs[ch][0])
+
+    def invalidate(self):
+        # A közös framebuffer-t közben a PlayingScreen is felülírhatta
+        self._last_rendered = None
+
+    def _draw(self, now_ns: Optional[int] = None) -> bool:
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+
+        # Monotonic óra: egy NTP ugrás nem fagyasztja be a villogást
+        if now_ns - self.last_blink_ns >= BLINK_NS:
             self.blink = not self.blink
-            self.last_blink = now
+            self.last_blink_ns = now_ns
 
-        if now - self.last_shift >= 60:
+        if now_ns - self.last_shift_ns >= SHIFT_NS:
             self.shift_x = (self.shift_x + 1) % 4
             self.shift_y = (self.shift_y + 1) % 4
-            self.last_shift = now
+            self.last_shift_ns = now_ns
 
-        t = time.localtime()
-        colon = ":" if self.blink else " "
-        timestr = f"{t.tm_hour:02d}{colon}{t.tm_min:02d}"
-        datestr = time.strftime("%Y-%m-%d")
-
-        with canvas(self.display) as draw:
-            # Óra középre (128x64 kijelzőn)
-            w = draw.textbbox((0, 0), timestr, font=self.font_big)[2]
+        # A kiírt idő viszont falióra
+        now = time.time()
+        minute = int(now) // 60
+        if minute != self._minute:
+            self._minute = minute
+            t = time.localtime(now)
+            self._timestr = f"{t.tm_hour:02d}:{t.tm_min:02d}"
+            self._datestr = time.strftime("%Y-%m-%d", t)
+
+        # Nincs változás -> nincs újrarajzolás, nincs I2C forgalom
+        key = (minute, self.blink, self.shift_x, self.shift_y)
+        prev = self._last_rendered
+        if key == prev:
+            return False
+        self._last_rendered = key
+
+        if prev is not None and prev[0] == minute and prev[2:] == key[2:]:
+            # Csak a kettőspont villant: a tinta-téglalapja törlődik, a többi pixel marad
+            with _display_lock:
+                cx, cy = self._colon_xy
+                l, t, r, b = self._colon_ink
+                self._img_draw.rectangle((cx + l, cy + t, cx + r - 1, cy + b - 1), fill=0)
+                if self.blink:
+                    self._img.paste(255, (cx, cy), self._glyphs_big[":"][0])
+                self._set_contrast(self.contrast)
+                self.display.display(self._img)
+            return True
+
+        timestr = self._timestr if self.blink else self._timestr.replace(":", " ")
+        datestr = self._datestr
+
+        with _display_lock:
+            draw = self._img_draw
+            draw.rectangle((0, 0, 127, 63), fill=0)
+
+            # Óra középre (128x64 kijelzőn); a pozíciókat a kettőspontos alakból mérjük,
+            # így villogáskor sem mozdulnak a számjegyek
+            offsets, w = self._time_layout or self._text_layout(self.font_big, self._timestr)
             x = (128 - w) // 2
             y = 12  # Körülbelül a felső 1/3
-            
-            draw.text((x, y), timestr, fill="white", font=self.font_big)
+
+            self._paste_text(self._glyphs_big, (x, y), timestr, offsets)
+            self._colon_xy = (x + offsets[2], y)
 
             # Dátum középre, alatta kis térközzel
-            dw = draw.textbbox((0, 0), datestr, font=self.font_small)[2]
-            draw.text(
-                ((128 - dw) // 2, y + 38),
-                datestr,
-                fill="white",
-                font=self.font_small,
-            )
-
-    async def update(self):
-        self._draw()
+            offsets, dw = self._date_layout or self._text_layout(self.font_small, datestr)
+            self._paste_text(self._glyphs_small, ((128 - dw) // 2, y + 38), datestr, offsets)
+
+            self._set_contrast(self.contrast)
+            self.display.display(self._img)
         return True
 
+    async def update(self, now_ns: Optional[int] = None):
+        return self._draw(now_ns)
+
 
 # ================= PLAYING SCREEN =================
 
 class PlayingScreen(NowPlayingExtractHandler):
-    def __init__(self, display, source_url: str, interval: float = 0.2, contrast = 180):
+    def __init__(
+        self,
+        display,
+        source_url: str,
+        interval: float = 0.2,
+        contrast = 180,
+        framebuffer: Optional[Image.Image] = None,
+    ):
         super().__init__(
             source_url=source_url,
             interval=interval,
@@ -366,8 +678,10 @@ class PlayingScreen(NowPlayingExtractHandler):
 
         self._render_enabled = True
 
-        self.font_big = ImageFont.truetype(FONT_BIG, 15)
-        self.font_small = ImageFont.truetype(FONT_SMALL, 12)
+        # BASIC layout: nincs raqm/HarfBuzz shaping; "1" módú képre a PIL eleve
+        # élsimítás nélkül raszterizál, így a görgetett szöveg olcsóbb
+        self.font_big = ImageFont.truetype(FONT_BIG, 15, layout_engine=ImageFont.Layout.BASIC)
+        self.font_small = ImageFont.truetype(FONT_SMALL, 12, layout_engine=ImageFont.Layout.BASIC)
 
         self._current_title = "Radio Most Kaposvár"
         self._current_volume = get_volume_percent()
@@ -382,6 +696,35 @@ class PlayingScreen(NowPlayingExtractHandler):
         self.shift_y = 0
         self.last_shift = 0
 
+        # Csak akkor rajzolunk, ha a kép ténylegesen változik
+        self._last_frame_key = None
+        self._text_w_cache: dict[str, int] = {}
+        # A cím felbontása és a szélességek címváltáskor számolódnak, nem frame-enként
+        self._artist = ""
+        self._song = ""
+        self._text_w_a = 0
+        self._text_w_s = 0
+        self._needs_scroll_a = False
+        self._needs_scroll_s = False
+        self._total_a = 0
+        self._total_s = 0
+        self._update_title_layout()
+
+        # Újrahasznált framebuffer; a flush szálban fut, hogy ne blokkolja az event loopot
+        if framebuffer is None:
+            framebuffer = Image.new("1", (128, 64), 0)
+        self._img = framebuffer
+        self._img_draw = ImageDraw.Draw(self._img)
+
+        # Hangerő-sáv bitmapek 5%-os lépésenként, hogy ne kelljen téglalapot raszterizálni
+        self._bar_imgs = []
+        for step in range(21):
+            bar = Image.new("1", (90 + 1, 4), 0)
+            bar.paste(1, (0, 0, 90 * step // 20 + 1, 4))
+            self._bar_imgs.append(bar)
+
+        self._draw_lock = asyncio.Lock()
+
         self._draw()
 
     def _set_contrast(self, val):
@@ -396,20 +739,39 @@ class PlayingScreen(NowPlayingExtractHandler):
 
     @render_enabled.setter
     def render_enabled(self, val):
+        if val and not self._render_enabled:
+            # Közben az idle screen rajzolt, a következő frame-et ki kell küldeni
+            self._last_frame_key = None
         self._render_enabled = val
 
-
-    def split_artist_title(self, title: str):
-        if "_-_" in title:
-            return (p.strip() for p in title.split("_-_", 1))
-        if " - " in title:
-            return (p.strip() for p in title.split(" - ", 1))
+    def split_artist_title(self, title: str) -> tuple[str, str]:
+        for sep in ("_-_", " - "):
+            if sep in title:
+                artist, song = title.split(sep, 1)
+                return artist.strip(), song.strip()
         return title.strip(), ""
 
-    def _scroll_text(self, draw, text, y, offset):
-        bbox = self.font_big.getbbox(text)
-        text_w = bbox[2] - bbox[0]
-
+    def _text_width(self, text: str) -> int:
+        text_w = self._text_w_cache.get(text)
+        if text_w is None:
+            if len(self._text_w_cache) >= 8:
+                self._text_w_cache.clear()
+            bbox = self.font_big.getbbox(text)
+            text_w = bbox[2] - bbox[0]
+            self._text_w_cache[text] = text_w
+        return text_w
+
+    def _update_title_layout(self):
+        self._artist, self._song = self.split_artist_title(self._current_title)
+        self._text_w_a = self._text_width(self._artist) if self._artist else 0
+        self._text_w_s = self._text_width(self._song) if self._song else 0
+        self._needs_scroll_a = self._text_w_a > 128
+        self._needs_scroll_s = self._text_w_s > 128
+        # Egy teljes scroll periódus hossza; az offset ezen belül marad
+        self._total_a = self._text_w_a + self._scroll_gap
+        self._total_s = self._text_w_s + self._scroll_gap
+
+    def _scroll_text(self, draw, text, text_w, y, offset):
         # Shift hozzáadása a burn-in elleni védelem miatt
         y_shifted = y + self.shift_y
 
@@ -417,14 +779,16 @@ class PlayingScreen(NowPlayingExtractHandler):
             draw.text((self.shift_x, y_shifted), text, fill="white", font=self.font_big)
             return
 
+        # offset már a periódusra redukálva érkezik
         total = text_w + self._scroll_gap
-        x = -(offset % total) + self.shift_x
+        x = -offset + self.shift_x
         draw.text((x, y_shifted), text, fill="white", font=self.font_big)
         draw.text((x + total, y_shifted), text, fill="white", font=self.font_big)
 
-    def _draw(self):
+    def _render(self) -> bool:
+        """Draw the next frame into self._img; False if there is nothing new to show."""
         if not self._render_enabled:
-            return
+            return False
         
         now = time.time()
         
@@ -434,27 +798,57 @@ class PlayingScreen(NowPlayingExtractHandler):
             self.shift_y = (self.shift_y + 1) % 4
             self.last_shift = now
         
-        artist, song = self.split_artist_title(self._current_title)
+        artist, song = self._artist, self._song
         # print(f"[DRAW] Artist: '{artist}' Song: '{song}'")  # DEBUG
         
-        now_str = time.strftime("%Y-%m-%d %H:%M")
-        vol = self._current_volume
-        
-        self._set_contrast(self.contrast)
-            
-        with canvas(self.display) as draw:
+        now_str = _now_hhmm()
+        vol_step = self._current_volume // 5
+
+        frame_key = (
+            artist,
+            song,
+            vol_step,
+            now_str,
+            self._scroll_offset_artist,
+            self._scroll_offset_song,
+            self.shift_x,
+            self.shift_y,
+        )
+        if frame_key == self._last_frame_key:
+            return False
+        self._last_frame_key = frame_key
+
+        # A közös framebuffer-t egy megszakított flush szála még olvashatja
+        with _display_lock:
+            draw = self._img_draw
+            draw.rectangle((0, 0, 127, 63), fill=0)
+
             if artist:
-                self._scroll_text(draw, artist, 0, self._scroll_offset_artist)
+                self._scroll_text(draw, artist, self._text_w_a, 0, self._scroll_offset_artist)
 
             if song:
-                self._scroll_text(draw, song, 18, self._scroll_offset_song)
+                self._scroll_text(draw, song, self._text_w_s, 18, self._scroll_offset_song)
 
             draw.text((self.shift_x, 36 + self.shift_y), "VOL", fill="white", font=self.font_small)
 
-            bar_w = int(90 * vol / 100)
-            draw.rectangle((30 + self.shift_x, 40 + self.shift_y, 30 + bar_w + self.shift_x, 43 + self.shift_y), fill="white")
+            self._img.paste(self._bar_imgs[vol_step], (30 + self.shift_x, 40 + self.shift_y))
 
             draw.text((self.shift_x, 50 + self.shift_y), now_str, fill="white", font=self.font_small)
+        return True
+
+    def _flush(self):
+        with _display_lock:
+            self._set_contrast(self.contrast)
+            self.display.display(self._img)
+
+    def _draw(self):
+        if self._render():
+            self._flush()
+
+    async def _draw_async(self):
+        async with self._draw_lock:
+            if self._render():
+                await asyncio.to_thread(self._flush)
 
     async def _oled_title_coro(self, title: Optional[str]) -> bool:
 
@@ -462,37 +856,51 @@ class PlayingScreen(NowPlayingExtractHandler):
             self._current_title = title
             self._scroll_offset_artist = 0
             self._scroll_offset_song = 0
-            self._draw()
+            # A szélesség-cache megmarad: visszatérő cím / jingle nem mérődik újra
+            self._update_title_layout()
+            await self._draw_async()
         return True
 
     async def _oled_update_coro(self) -> bool:
 
-        self._scroll_offset_artist += self._scroll_speed
-        self._scroll_offset_song += self._scroll_speed
-        self._current_volume = get_volume_percent()
-        self._draw()
+        if self._needs_scroll_a:
+            self._scroll_offset_artist = (self._scroll_offset_artist + self._scroll_speed) % self._total_a
+        if self._needs_scroll_s:
+            self._scroll_offset_song = (self._scroll_offset_song + self._scroll_speed) % self._total_s
+        await self._draw_async()
         return True
 
+    def set_volume(self, volume: int):
+        # A hangerőt az MPD mixer eseménye hozza, nem kell tick-enként lekérdezni
+        self._current_volume = volume
+
 
 # ================= STATE MACHINE =================
 
 class MoodeStateMachine:
     def __init__(self):
         self.serial = i2c(port=1, address=I2C_ADDR)
-        self.display = sh1106(self.serial, width=128, height=64)
+        self.display = PagedSH1106(self.serial, width=128, height=64)
 
         self.state = None
-        self.last_poll = 0
+        self.events: asyncio.Queue = asyncio.Queue()
+
+        self.last_transition = time.monotonic()
+        self.poll_interval = FAILSAFE_FAST
+        self.next_poll = self.last_transition + self.poll_interval
+
+        # Egyetlen 1 bites framebuffer mindkét képernyőnek
+        self.framebuffer = Image.new("1", (128, 64), 0)
 
-        self.idle_screen = IdleScreen(self.display)
+        self.idle_screen = IdleScreen(self.display, framebuffer=self.framebuffer)
 
-        self.playing_screen  = PlayingScreen(self.display, STREAM_URL)
+        self.playing_screen  = PlayingScreen(self.display, STREAM_URL, framebuffer=self.framebuffer)
         self.play_task: asyncio.Task | None = None
 
         self.CONTRAST_IDLE = 40
         self.CONTRAST_PLAYING = 180
 
-        self.button = GPIOButton(BUTTON_PIN, toggle_play_pause)
+        self.button = GPIOButton(BUTTON_PIN, self._on_button)
 
         self.state = get_state()
         self._apply_state(self.state)
@@ -500,50 +908,115 @@ class MoodeStateMachine:
 
     def _apply_state(self, new_state):
         self.playing_screen.render_enabled = (new_state == STATE_PLAYING)
-
         if new_state == STATE_IDLE:
+            self.idle_screen.invalidate()
+
             # STATE_IDLE-re váltunk, szükség a play_task rendszeres leállítására
             if self.play_task:
                 self.play_task.cancel()
                 self.play_task = None
-        
+
+        # Váltás után újra sűrűn ellenőrzünk
+        self.last_transition = time.monotonic()
+        self.poll_interval = FAILSAFE_FAST
+        self.next_poll = self.last_transition + self.poll_interval
+
         self.state = new_state
 
+    def _on_button(self):
+        # Az MPD hívás worker szálon fut, hogy egy lassú válasz ne akassza meg a renderelést
+        asyncio.get_running_loop().run_in_executor(None, toggle_play_pause)
+
+    def _schedule_poll(self, now: float):
+        if now - self.last_transition < FAILSAFE_FAST_WINDOW:
+            self.poll_interval = FAILSAFE_FAST
+        else:
+            self.poll_interval = min(FAILSAFE_MAX, self.poll_interval * 1.5)
+        self.next_poll = now + self.poll_interval
+
+    async def _mpd_events(self):
+        """Second MPD connection parked in `idle player mixer`; pushes changes onto self.events."""
+        global _mpd_reachable
+        while True:
+            writer = None
+            try:
+                reader, writer = await _mpd_open_async()
+
+                while True:
+                    status = await _mpd_async_command(reader, writer, "status")
+                    _mpd_reachable = True
+                    playing = status.get("state") == "play"
+                    await self.events.put(("state", STATE_PLAYING if playing else STATE_IDLE))
+
+                    # MPD -1-et ad, ha nincs mixer
+                    vol = int(status.get("volume", -1))
+                    if vol >= 0:
+                        await self.events.put(("volume", min(100, vol)))
+
+                    # Itt alszik, amíg a lejátszás vagy a hangerő nem változik
+                    await _mpd_async_command(reader, writer, "idle player mixer")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Ugyanaz a váltás-alapú log, mint a pollingnál: leállt MPD mellett nincs másodpercenkénti spam
+                _mpd_error(e)
+                await asyncio.sleep(1.0)
+            finally:
+                if writer is not None:
+                    writer.close()
+
     async def run(self):
+        self.button.start(asyncio.get_running_loop())
+        events_task = asyncio.create_task(self._mpd_events())
         try:
             while True:
-                now = time.monotonic()
-
-                if now - self.last_poll > POLL_INTERVAL:
-                    new_state = get_state()
-                    if new_state != self.state:
-                        # STATE_IDLE-re váltunk, gondoskodunk az async cleanup-ról
-                        if new_state == STATE_IDLE and self.play_task:
-                            self.play_task.cancel()
-                            try:
-                                await asyncio.wait_for(self.play_task, timeout=0.5)
-                            except (asyncio.CancelledError, asyncio.TimeoutError):
-                                pass
-                            self.play_task = None
-                        
-                        self._apply_state(new_state)
-
-                    # Indítsd el a playing screen-t, ha STATE_PLAYING-ben vagyunk
-                    if self.state == STATE_PLAYING and self.play_task is None:
-                        self.play_task = asyncio.create_task(
-                            self.playing_screen._main()
-                        )
-
-                    self.last_poll = now
+                # Egy időlekérdezés iterációnként
+                now_ns = time.monotonic_ns()
+                mono = now_ns / 1e9
+
+                # Indítsd el a playing screen-t, ha STATE_PLAYING-ben vagyunk
+                if self.state == STATE_PLAYING and self.play_task is None:
+                    self.play_task = asyncio.create_task(
+                        self.playing_screen._main()
+                    )
 
                 # Frissítsd az aktuális screent
                 if self.state == STATE_IDLE:
-                    await self.idle_screen.update()
-                # STATE_PLAYING-ben a playing_screen._main() task gondoskodik a frissítésről
+                    await self.idle_screen.update(now_ns)
 
-                await asyncio.sleep(0.2)
+                # Fail-safe: ha az idle kapcsolat elakadna, a váltást így is észrevesszük
+                if mono >= self.next_poll:
+                    self.events.put_nowait(("state", await asyncio.to_thread(get_state)))
+                    self._schedule_poll(mono)
+
+                # STATE_PLAYING-ben a playing_screen._main() task gondoskodik a frissítésről,
+                # itt csak az MPD eseményére várunk. STATE_IDLE-ben pontosan
+                # a következő óra-változásig alszunk, fix tick nélkül.
+                timeout = max(0.0, self.next_poll - mono)
+                if self.state == STATE_IDLE:
+                    timeout = min(timeout, self.idle_screen.next_wakeup(now_ns))
+                try:
+                    kind, value = await asyncio.wait_for(self.events.get(), timeout)
+                except asyncio.TimeoutError:
+                    kind, value = None, None
+
+                if kind == "state" and value != self.state:
+                    # STATE_IDLE-re váltunk, gondoskodunk az async cleanup-ról
+                    if value == STATE_IDLE and self.play_task:
+                        self.play_task.cancel()
+                        try:
+                            await asyncio.wait_for(self.play_task, timeout=0.5)
+                        except (asyncio.CancelledError, asyncio.TimeoutError):
+                            pass
+                        self.play_task = None
+
+                    self._apply_state(value)
+                elif kind == "volume":
+                    self.playing_screen.set_volume(value)
 
         finally:
+            events_task.cancel()
+
             if self.play_task:
                 self.play_task.cancel()
 
@@ -0,0 +1,77 @@
+import sys
+import time
+from pathlib import Path
+
+from PIL import ImageChops
+
+# Az IdleScreen a scripts mappában van
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+import moode_state_machine as sm
+
+# Kijelző nélkül ellenőrzi, hogy a villogáskori részleges frissítés
+# (csak a kettőspont cellája) pixelre ugyanazt adja, mint a teljes újrarajzolás,
+# a dátum sorral együtt.
+
+
+class FakeDisplay:
+    def contrast(self, val):
+        pass
+
+    def display(self, image):
+        pass
+
+
+class FakeClock:
+    """Stands in for the `time` module so the wall-clock minute can be set."""
+
+    localtime = staticmethod(time.localtime)
+    strftime = staticmethod(time.strftime)
+    monotonic_ns = staticmethod(time.monotonic_ns)
+
+    def __init__(self):
+        self.wall = 0.0
+
+    def time(self):
+        return self.wall
+
+
+def check_minute(inc, ref, wall: float, blink: bool) -> bool:
+    clock.wall = wall
+    now_ns = time.monotonic_ns()
+
+    # Teljes kompozíció, majd egy villanás -> részleges frissítés
+    inc.blink = blink
+    inc.last_blink_ns = now_ns
+    inc.invalidate()
+    inc._draw(now_ns)
+    inc._draw(now_ns + sm.BLINK_NS)
+
+    # Referencia: ugyanaz az állapot, egyben újrarajzolva
+    ref.blink = inc.blink
+    ref.last_blink_ns = now_ns + sm.BLINK_NS
+    ref.shift_x, ref.shift_y = inc.shift_x, inc.shift_y
+    ref.last_shift_ns = inc.last_shift_ns
+    ref.invalidate()
+    ref._draw(now_ns + sm.BLINK_NS)
+
+    diff = ImageChops.difference(inc._img, ref._img).getbbox()
+    if diff:
+        print(f"FAIL {time.strftime('%Y-%m-%d %H:%M', time.localtime(wall))} blink={inc.blink} diff={diff}")
+    return diff is None
+
+
+clock = FakeClock()
+sm.time = clock
+
+inc = sm.IdleScreen(FakeDisplay())
+ref = sm.IdleScreen(FakeDisplay())
+
+start = time.mktime((2026, 10, 14, 0, 0, 0, 0, 0, -1))
+ok = True
+# Egy teljes nap minden perce, mindkét villogási fázisból indulva
+for m in range(24 * 60):
+    for blink in (True, False):
+        ok &= check_minute(inc, ref, start + m * 60, blink)
+
+print("OK" if ok else "FAIL")
+sys.exit(0 if ok else 1)
@@ -1,14 +1,18 @@
 #!/home/fajtai/scripts/.venv/bin/python
 import requests
 import asyncio
+import sys
 import time
-import re
+from pathlib import Path
 from typing import Optional, Callable
 
-from PIL import ImageFont
+from PIL import Image, ImageDraw, ImageFont
 from luma.core.interface.serial import i2c
 from luma.oled.device import sh1106
-from luma.core.render import canvas
+
+# A közös ICY olvasó a scripts mappában van
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from icy_reader import ICYReader, extract_title
 
 
 FONT_PATH = "./fonts/NotoSans-Medium.ttf"
@@ -18,11 +22,18 @@ MOODE_URL  = "http://localhost/command/?cmd=get_volume"
 
 # ------------------ segédfüggvények ------------------
 
-def extract_title(metadata: str) -> Optional[str]:
-    m = re.search(r"StreamTitle='([^';]+)", metadata)
-    if not m:
-        return None
-    return m.group(1).strip()
+_last_minute = -1
+_last_time_str = ""
+
+
+def _now_hhmm() -> str:
+    """Date + time string, formatted only once per minute."""
+    global _last_minute, _last_time_str
+    minute = int(time.time()) // 60
+    if minute != _last_minute:
+        _last_minute = minute
+        _last_time_str = time.strftime("%Y-%m-%d %H:%M")
+    return _last_time_str
 
 
 def get_volume_percent() -> int:
@@ -51,69 +62,64 @@ class NowPlayingExtractHandler:
         self.coro = coro
         self.update_coro = update_coro
 
-        self._last_metadata = ""
+        self._last_metadata = b""
         self.last_title = ""
 
         self._stop_event = asyncio.Event()
-        self._session = None
+        self._reader = ICYReader(source_url, timeout=10)
 
-    def _read_metadata(self) -> str:
+    def _read_metadata(self) -> bytes:
         try:
-            r = self._session.get(self.source_url, stream=True, timeout=10)
-            r.raise_for_status()
-
-            metaint = int(r.headers.get("icy-metaint", "0"))
-            if not metaint:
-                return ""
-
-            _ = r.raw.read(metaint)
-            lb = r.raw.read(1)
-            if not lb:
-                return ""
-
-            meta_len = ord(lb) * 16
-            if meta_len:
-                meta = r.raw.read(meta_len)
-                return meta.decode("iso-8859-2", "ignore")
+            if not self._reader.is_open and not self._reader.open():
+                return b""
+            return self._reader.read_next_meta()
         except Exception:
-            pass
-        return ""
+            self._reader.close()
+        return b""
 
-    async def _loop(self):
+    async def _meta_loop(self):
+        # a blokkoló stream olvasás worker szálon fut, és csak címváltozást jelez,
+        # így az event loop és a tick nem az audio bitrátához igazodik
+        while not self._stop_event.is_set():
+            meta = await asyncio.to_thread(self._read_metadata)
+            if not meta:
+                # csak lezárt reader (hiba) után várunk; üres blokk -> azonnal a következő
+                if not self._reader.is_open:
+                    await asyncio.sleep(self.interval)
+                continue
+
+            # csak változáskor másolunk és dekódolunk
+            if meta != self._last_metadata:
+                self._last_metadata = bytes(meta)
+                self.last_title = extract_title(meta) or ""
+                if self.coro:
+                    await self.coro(self.last_title)
+
+    async def _tick_loop(self):
         next_t = time.monotonic() + self.interval
 
         while not self._stop_event.is_set():
             try:
-                meta = self._read_metadata()
-                if meta:
-                    if meta != self._last_metadata:
-                        self._last_metadata = meta
-                        self.last_title = extract_title(meta) or ""
-                        if self.coro:
-                            await self.coro(self.last_title)
-                    else:
-                        if self.coro:
-                            await self.coro(None)
-
                 if self.update_coro:
                     await self.update_coro()
-
             finally:
                 delay = next_t - time.monotonic()
                 if delay > 0:
                     await asyncio.sleep(delay)
                 next_t += self.interval
 
+    async def _loop(self):
+        meta_task = asyncio.create_task(self._meta_loop())
+        try:
+            await self._tick_loop()
+        finally:
+            meta_task.cancel()
+
     async def _main(self):
-        self._session = requests.Session()
-        self._session.headers.update({
-            "Icy-MetaData": "1",
-            "User-Agent": "RadioMetadataExtractor/1.0",
-        })
         try:
             await self._loop()
         finally:
-            self._session.close()
+            self._reader.close()
 
     def start(self):
         if self._stop_event.is_set():
@@ -136,9 +142,20 @@ class OLEDNowPlayingWithVolumeHandler(NowPlayingExtractHandler):
         self.serial = i2c(port=1, address=0x3C)
         self.device = sh1106(self.serial, width=128, height=64)
 
+        # egy framebuffer az egész futásra, a canvas() frame-enkénti allokációja helyett
+        self._img = Image.new("1", (128, 64), 0)
+        self._img_draw = ImageDraw.Draw(self._img)
+
+        # Hangerő-sáv bitmapek 5%-os lépésenként, hogy ne kelljen téglalapot raszterizálni
+        self._bar_imgs = []
+        for step in range(21):
+            bar = Image.new("1", (70 + 1, 4), 0)
+            bar.paste(1, (0, 0, 70 * step // 20 + 1, 4))
+            self._bar_imgs.append(bar)
+
         # nagyobb betűk
-        self.font_big = ImageFont.truetype(FONT_PATH, 15)
-        self.font_small = ImageFont.truetype(FONT_PATH, 12)
+        self.font_big = ImageFont.truetype(FONT_PATH, 15, layout_engine=ImageFont.Layout.BASIC)
+        self.font_small = ImageFont.truetype(FONT_PATH, 12, layout_engine=ImageFont.Layout.BASIC)
 
         self._current_title = "Radio Most Kaposvár"
         self._current_volume = get_volume_percent()
@@ -148,66 +165,113 @@ class OLEDNowPlayingWithVolumeHandler(NowPlayingExtractHandler):
         self._scroll_speed = 1
         self._scroll_gap = 20
 
-        self._draw()
+        # csak változás esetén küldünk frame-et az I2C buszra
+        self._last_frame_key = None
+        self._text_w_cache: dict[str, int] = {}
+        # A cím felbontása és a szélességek címváltáskor számolódnak, nem frame-enként
+        self._artist = ""
+        self._song = ""
+        self._text_w_a = 0
+        self._text_w_s = 0
+        self._needs_scroll_a = False
+        self._needs_scroll_s = False
+        self._total_a = 0
+        self._total_s = 0
+        self._update_title_layout()
 
-    def split_artist_title(self, title: str):
-        if "_-_" in title:
-            a, b = (p.strip() for p in title.split("_-_", 1))
-        elif " - " in title:
-            a, b = (p.strip() for p in title.split(" - ", 1))
-        else:
-            return title.strip(), ""
-        return a, b
-
-    def _scroll_text(self, draw, text, y, offset):
-        bbox = self.font_big.getbbox(text)
-        text_w = bbox[2] - bbox[0]
+        self._draw()
 
+    def split_artist_title(self, title: str) -> tuple[str, str]:
+        for sep in ("_-_", " - "):
+            if sep in title:
+                artist, song = title.split(sep, 1)
+                return artist.strip(), song.strip()
+        return title.strip(), ""
+
+    def _text_width(self, text: str) -> int:
+        text_w = self._text_w_cache.get(text)
+        if text_w is None:
+            if len(self._text_w_cache) >= 8:
+                self._text_w_cache.clear()
+            bbox = self.font_big.getbbox(text)
+            text_w = bbox[2] - bbox[0]
+            self._text_w_cache[text] = text_w
+        return text_w
+
+    def _update_title_layout(self):
+        self._artist, self._song = self.split_artist_title(self._current_title)
+        self._text_w_a = self._text_width(self._artist) if self._artist else 0
+        self._text_w_s = self._text_width(self._song) if self._song else 0
+        self._needs_scroll_a = self._text_w_a > 128
+        self._needs_scroll_s = self._text_w_s > 128
+        # Egy teljes scroll periódus hossza; az offset ezen belül marad
+        self._total_a = self._text_w_a + self._scroll_gap
+        self._total_s = self._text_w_s + self._scroll_gap
+
+    def _scroll_text(self, draw, text, text_w, y, offset):
         if text_w <= 128:
             draw.text((0, y), text, fill="white", font=self.font_big)
             return
 
+        # offset már a periódusra redukálva érkezik
         total = text_w + self._scroll_gap
-        x = -(offset % total)
+        x = -offset
         draw.text((x, y), text, fill="white", font=self.font_big)
         draw.text((x + total, y), text, fill="white", font=self.font_big)
 
     def _draw(self):
-        artist, song = self.split_artist_title(self._current_title)
-        now = time.strftime("%Y-%m-%d %H:%M")
-        vol = self._current_volume
+        artist, song = self._artist, self._song
+        now = _now_hhmm()
+        vol_step = self._current_volume // 5
+
+        frame_key = (
+            artist,
+            song,
+            vol_step,
+            now,
+            self._scroll_offset_artist,
+            self._scroll_offset_song,
+        )
+        if frame_key == self._last_frame_key:
+            return
+        self._last_frame_key = frame_key
 
-        with canvas(self.device) as draw:
+        draw = self._img_draw
+        draw.rectangle((0, 0, 127, 63), fill=0)
 
-            # 1. sor – előadó (scroll)
-            if artist:
-                self._scroll_text(draw, artist, 0, self._scroll_offset_artist)
+        # 1. sor – előadó (scroll)
+        if artist:
+            self._scroll_text(draw, artist, self._text_w_a, 0, self._scroll_offset_artist)
 
-            # 2. sor – szám címe (scroll)
-            if song:
-                self._scroll_text(draw, song, 18, self._scroll_offset_song)
+        # 2. sor – szám címe (scroll)
+        if song:
+            self._scroll_text(draw, song, self._text_w_s, 18, self._scroll_offset_song)
 
-            # 3. sor – VOL + kisebb sáv
-            draw.text((0, 36), "VOL", fill="white", font=self.font_small)
+        # 3. sor – VOL + kisebb sáv
+        draw.text((0, 36), "VOL", fill="white", font=self.font_small)
 
-            bar_w = int(70 * vol / 100)
-            draw.rectangle((30, 40, 30 + bar_w, 43), fill="white")
+        self._img.paste(self._bar_imgs[vol_step], (30, 40))
 
-            # 4. sor – dátum + idő
-            draw.text((0, 50), now, fill="white", font=self.font_small)
+        # 4. sor – dátum + idő
+        draw.text((0, 50), now, fill="white", font=self.font_small)
 
+        self.device.display(self._img)
 
     async def _oled_title_coro(self, title: Optional[str]) -> bool:
         if title and title != self._current_title:
             self._current_title = title
             self._scroll_offset_artist = 0
             self._scroll_offset_song = 0
+            # A szélesség-cache megmarad: visszatérő cím / jingle nem mérődik újra
+            self._update_title_layout()
             self._draw()
         return True
 
     async def _oled_update_coro(self) -> bool:
-        self._scroll_offset_artist += self._scroll_speed
-        self._scroll_offset_song += self._scroll_speed
+        if self._needs_scroll_a:
+            self._scroll_offset_artist = (self._scroll_offset_artist + self._scroll_speed) % self._total_a
+        if self._needs_scroll_s:
+            self._scroll_offset_song = (self._scroll_offset_song + self._scroll_speed) % self._total_s
         self._current_volume = get_volume_percent()
         self._draw()
         return True
@@ -1,20 +1,13 @@
-import requests
+import sys
 import time
-import re
-from io import BytesIO
+from pathlib import Path
 
 import asyncio
 from typing import Callable, Optional
 
-
-def extract_title(metadata):
-    """Extract StreamTitle from raw ICY metadata string"""
-    import re
-    title_match = re.search(r"StreamTitle='([^';]+)", metadata)
-    if title_match:
-        title = title_match.group(1)
-        return title.strip()
-    return None
+# A közös ICY olvasó a scripts mappában van
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+from icy_reader import ICYReader, extract_title
 
 
 
@@ -28,7 +21,7 @@ class NowPlayingExtractHandler():
 
         self.coro = coro
 
-        self._last_metadata = ""
+        self._last_metadata = b""
         self.last_title = ""
 
         self._stop_event = asyncio.Event()
@@ -36,58 +29,26 @@ class NowPlayingExtractHandler():
 
         self._task: asyncio.Task = None
 
-        self._session = None
+        self._reader = ICYReader(source_url, timeout=10)
 
 
     def _read_metadata(self, verbose = False):
-        metadata = ""
-
         try:
-            response = self._session.get(self.source_url, stream=True)
-            response.raise_for_status()
-            
-            metaint = None
-            content_type = response.headers.get('content-type', '')
-
-            # Parse Icecast/Shoutcast metaint from headers
-            metaint_header = response.headers.get('icy-metaint')
-            if metaint_header:
-                metaint = int(metaint_header)
-                if verbose:
-                    print(f"Metadata interval: {metaint} bytes [web:10]")
-            else:
-                if verbose:
-                    print("No ICY metadata found in headers")
-                return
-            
-            if 'aac' in content_type.lower():
+            if not self._reader.is_open:
+                if not self._reader.open():
+                    if verbose:
+                        print("No ICY metadata found in headers")
+                    return b""
                 if verbose:
-                    print("AAC stream detected - using ICY metadata parsing")
-            
-            bytes_read = 0
-
-            data = response.raw.read(metaint - bytes_read)      
-
-            if not data:
-                return metadata
+                    print(f"Metadata interval: {self._reader.metaint} bytes")
 
-            bytes_read += len(data)
-
-            if bytes_read >= metaint:
-                # Read metadata length byte
-                metadata_len_byte = response.raw.read(1)
-                if metadata_len_byte:
-                    metadata_len = ord(metadata_len_byte) * 16
-                    if metadata_len > 0:
-                        _metadata = response.raw.read(metadata_len)
-                        metadata = _metadata.decode('iso-8859-2', errors='ignore')
-                                    
-            return metadata
+            return self._reader.read_next_meta()
 
         except Exception as e:
             print(e)
+            self._reader.close()
 
-        return metadata
+        return b""
 
     async def _loop(self):
         next_time = time.monotonic() + self.interval
@@ -95,9 +56,9 @@ class NowPlayingExtractHandler():
         while not self._stop_event.is_set():
             try:
                 new_metadata = self._read_metadata()
-                if new_metadata != "":
+                if new_metadata:
                     if self._last_metadata != new_metadata:
-                        self._last_metadata = new_metadata
+                        self._last_metadata = bytes(new_metadata)
                     
                         self.last_title = extract_title(self._last_metadata)
 
@@ -119,18 +80,10 @@ class NowPlayingExtractHandler():
     async def _main(self):
         self._task = asyncio.create_task(self._loop())
         await self._task
-        self._session.close()
+        self._reader.close()
 
     def start(self):
-        if isinstance(self._session,requests.Session):
-            self._session.close()
-
-        self._session = requests.Session()
-        self._session.headers.update({
-        'Icy-MetaData': '1',  # Request metadata
-        'User-Agent': 'RadioMetadataExtractor/1.0'
-        })
-
+        self._reader.close()
 
         if self._is_running:
             return
@@ -1,22 +1,25 @@
 #!/usr/bin/env python3
 from luma.core.interface.serial import i2c
 from luma.oled.device import sh1106
-from luma.core.render import canvas
-from PIL import ImageFont
-import time
+from PIL import Image, ImageDraw, ImageFont
+from signal import pause
 
 serial = i2c(port=1, address=0x3C)
 device = sh1106(serial, width=128, height=64)
 
 font = ImageFont.truetype(
-    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12,
+    layout_engine=ImageFont.Layout.BASIC,
 )
 
-while True:
-    with canvas(device) as draw:
-        draw.text((0, 0), "OLED OK", fill="white", font=font)
-        draw.text((0, 16), "1234567890", fill="white", font=font)
-        draw.text((0, 32), "abcdef ABCDEF", fill="white", font=font)
-        draw.text((0, 48), "áéíóöőúüű", fill="white", font=font)
+FB_IMG = Image.new("1", (128, 64))
+FB_DRAW = ImageDraw.Draw(FB_IMG)
 
-    time.sleep(1)
\ No newline at end of file
+FB_DRAW.text((0, 0), "OLED OK", fill="white", font=font)
+FB_DRAW.text((0, 16), "1234567890", fill="white", font=font)
+FB_DRAW.text((0, 32), "abcdef ABCDEF", fill="white", font=font)
+FB_DRAW.text((0, 48), "áéíóöőúüű", fill="white", font=font)
+device.display(FB_IMG)
+
+# Statikus tartalom: az SH1106 megtartja a RAM-ját, nincs mit újraküldeni
+pause()
\ No newline at end of file
@@ -1,32 +1,216 @@
 #!/home/fajtai/scripts/.venv/bin/python
-import requests
+import socket
+import threading
 import gpiozero
+import gpiod
+from gpiod.line import Direction, Bias, Edge, Value
 from signal import pause
+from urllib.parse import quote
 
 # === SAJÁT PARANCSOK (MEGTARTVA) ===
-VOLUME_BASE = "http://localhost/command/?cmd="
-LEFT_URL  = f"{VOLUME_BASE}set_volume dn 5"
-RIGHT_URL = f"{VOLUME_BASE}set_volume up 5"
+MOODE_HOST = "127.0.0.1"
+MOODE_PORT = 80
+VOLUME_BASE = "/command/?cmd="
+LEFT_URL  = f"{VOLUME_BASE}set_volume dn {{}}"
+RIGHT_URL = f"{VOLUME_BASE}set_volume up {{}}"
 SHORT_URL = f"{VOLUME_BASE}toggle_play_pause"
 LONG_URL  = f"{VOLUME_BASE}set_volume 0"
+VOLUME_STEP = 5
+
+class StaleConnection(ConnectionError):
+    """The reused keep-alive socket was closed before any response byte arrived."""
+
+
+class KeepAliveHTTP:
+    """
+    Minimal HTTP/1.1 GET client over one persistent localhost socket.
+    Replaces `requests` for the moOde command port.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = 0.3):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+        self._sock: socket.socket | None = None
+        self._rfile = None
+        # A Timer és a gombkezelő külön szálról is küldhet
+        self._lock = threading.Lock()
+
+    def close(self):
+        if self._sock is not None:
+            try:
+                self._rfile.close()
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._rfile = None
+
+    def _connect(self):
+        self.close()
+        self._sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self._rfile = self._sock.makefile("rb")
+
+    def _read_body(self, headers: dict[bytes, bytes]) -> bool:
+        """Consume the body; False if the server closes the connection after it."""
+        if b"content-length" in headers:
+            self._rfile.read(int(headers[b"content-length"]))
+        elif headers.get(b"transfer-encoding", b"").lower() == b"chunked":
+            while True:
+                size = int(self._rfile.readline().split(b";", 1)[0], 16)
+                self._rfile.read(size + 2)  # adat + CRLF
+                if not size:
+                    break
+        else:
+            self._rfile.read()
+            return False
+        return headers.get(b"connection", b"").lower() != b"close"
+
+    def _exchange(self, path: str) -> int:
+        try:
+            self._sock.sendall(
+                f"GET {quote(path, safe='/?=&')} HTTP/1.1\r\n"
+                f"Host: localhost\r\n"
+                "Connection: keep-alive\r\n"
+                "\r\n".encode("latin-1")
+            )
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise StaleConnection("HTTP connection closed before send") from e
+
+        status = self._rfile.readline()
+        if not status:
+            raise StaleConnection("HTTP connection closed before response")
+
+        headers = {}
+        while True:
+            line = self._rfile.readline()
+            if not line:
+                raise ConnectionError("HTTP connection closed in headers")
+            if line in (b"\r\n", b"\n"):
+                break
+            key, _, value = line.partition(b":")
+            headers[key.strip().lower()] = value.strip()
+
+        if not self._read_body(headers):
+            self.close()
+        return int(status.split()[1])
+
+    def get(self, path: str) -> int:
+        with self._lock:
+            reused = self._sock is not None
+            try:
+                if not reused:
+                    self._connect()
+                return self._exchange(path)
+            except StaleConnection:
+                self.close()
+                if not reused:
+                    raise
+            except (OSError, ValueError):
+                # Timeout vagy hibás válasz: a parancs már kimehetett, nem küldjük újra
+                self.close()
+                raise
+
+            # A szerver közben bontotta a keep-alive kapcsolatot, mielőtt
+            # bármit válaszolt volna: egyszer, új kapcsolaton megismételjük
+            try:
+                self._connect()
+                return self._exchange(path)
+            except (OSError, ValueError):
+                self.close()
+                raise
+
+
+HTTP = KeepAliveHTTP(MOODE_HOST, MOODE_PORT)
+
+# Kapcsolat előkészítése: az első tekerés/nyomás már a meglévő keep-alive kapcsolatot kapja
+try:
+    HTTP.get(f"{VOLUME_BASE}get_volume")
+except Exception:
+    pass
+
+# Gyors tekerésnél a lépéseket összegyűjtjük, és egyetlen kérésben küldjük el
+COALESCE_S = 0.05
 
 # === PINOK: S1=17, S2=27, KEY=22 ===
-encoder = gpiozero.RotaryEncoder(17, 27, wrap=False)
+GPIO_CHIP = "/dev/gpiochip0"
+ENC_A, ENC_B = 17, 27
 button = gpiozero.Button(22, hold_time=1.0)
 
+# Enkóder: libgpiod él-események, a szál a request fd-jén alszik (nincs polling szál)
+enc_request = gpiod.request_lines(
+    GPIO_CHIP,
+    consumer="rotary-encoder",
+    config={
+        (ENC_A, ENC_B): gpiod.LineSettings(
+            direction=Direction.INPUT,
+            bias=Bias.PULL_UP,
+            edge_detection=Edge.BOTH,
+        )
+    },
+)
+
+# Kvadratúra dekódolás: QUAD_TABLE[(előző << 2) | jelenlegi] -> -1 / 0 / +1,
+# az állapot (A << 1) | B; kihagyott (érvénytelen) átmenet 0. Irány fordításához cseréld a pineket.
+QUAD_TABLE = (0, -1, 1, 0, 1, 0, 0, -1, -1, 0, 0, 1, 0, 1, -1, 0)
+TRANSITIONS_PER_STEP = 4  # egy kattanás = egy teljes ciklus
+
+_pending_delta = 0
+_flush_timer = None
+# Az enkóder szál és a Timer külön szálon fut
+_pending_lock = threading.Lock()
+
 def send_http(url, emoji):
     try:
-        requests.get(url, timeout=0.3)
+        HTTP.get(url)
         print(f"{emoji} OK")
     except:
         print(f"{emoji} FAIL")
 
-def on_rotate():
-    steps = encoder.steps
-    if steps > 0:
-        send_http(RIGHT_URL, "➡️ up 5")
-    elif steps < 0:
-        send_http(LEFT_URL, "⬅️ dn 5")
+def flush_volume():
+    global _pending_delta
+    with _pending_lock:
+        delta, _pending_delta = _pending_delta, 0
+    amount = abs(delta) * VOLUME_STEP
+    if delta > 0:
+        send_http(RIGHT_URL.format(amount), f"➡️ up {amount}")
+    elif delta < 0:
+        send_http(LEFT_URL.format(amount), f"⬅️ dn {amount}")
+
+def on_rotate(steps):
+    global _pending_delta, _flush_timer
+    with _pending_lock:
+        _pending_delta += steps
+
+        # Újraindítjuk a timert: csak a tekerés megállása után megy ki a kérés
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+        _flush_timer = threading.Timer(COALESCE_S, flush_volume)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+def encoder_loop():
+    levels = {
+        ENC_A: int(enc_request.get_value(ENC_A) == Value.ACTIVE),
+        ENC_B: int(enc_request.get_value(ENC_B) == Value.ACTIVE),
+    }
+    state = (levels[ENC_A] << 1) | levels[ENC_B]
+    sub = 0
+
+    while True:
+        enc_request.wait_edge_events()  # blokkol, amíg nincs él
+        for event in enc_request.read_edge_events():
+            levels[event.line_offset] = int(event.event_type == gpiod.EdgeEvent.Type.RISING_EDGE)
+            new_state = (levels[ENC_A] << 1) | levels[ENC_B]
+            sub += QUAD_TABLE[(state << 2) | new_state]
+            state = new_state
+
+        # Egész kattanások továbbítása, a maradék (fél ciklus) megmarad
+        steps = int(sub / TRANSITIONS_PER_STEP)
+        if steps:
+            sub -= steps * TRANSITIONS_PER_STEP
+            on_rotate(steps)
 
 def short_press():
     send_http(SHORT_URL, "▶️ toggle")
@@ -35,7 +219,7 @@ def long_press():
     send_http(LONG_URL, "🔇 mute 0")
 
 # === ESEMÉNYKEZELŐK ===
-encoder.when_rotated = on_rotate
+threading.Thread(target=encoder_loop, daemon=True).start()
 button.when_pressed = short_press
 button.when_held = long_press
 